@@ -1,258 +1,373 @@
 import timeit
-from functools import lru_cache
+from array import array
+from functools import cache, partial
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend: render straight to a file, no GUI
 import matplotlib.pyplot as plt
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to pure Python
+    njit = None
+
 # ------------------------------
 # 1. LRU-BASED FIBONACCI
 # ------------------------------
-@lru_cache(maxsize=None)
+def _fib_doubling(n: int) -> tuple:
+    """
+    Return the pair (F(n), F(n+1)) using the fast-doubling identities:
+    F(2k) = F(k) * (2*F(k+1) - F(k)), F(2k+1) = F(k)^2 + F(k+1)^2.
+    Recursion depth is only O(log n).
+    """
+    if n == 0:
+        return 0, 1
+    a, b = _fib_doubling(n >> 1)
+    c = a * ((b << 1) - a)
+    d = a * a + b * b
+    if n & 1:
+        return d, c + d
+    return c, d
+
+# Largest n for which F(n) still fits into a signed 64-bit integer
+INT64_FIB_LIMIT = 92
+
+def _fib_loop(n):
+    """
+    Plain iterative Fibonacci loop, compiled with Numba when available.
+    Only valid for n <= INT64_FIB_LIMIT once compiled (int64 arithmetic).
+    """
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+_fib_native = njit(cache=True)(_fib_loop) if njit else None
+
+@cache
 def fibonacci_lru(n: int) -> int:
     """
-    Compute the nth Fibonacci number using recursion
-    and Python's built-in @lru_cache decorator.
+    Compute the nth Fibonacci number with the fast-doubling method.
+    Small n that fit into int64 go through the Numba-compiled loop if Numba is installed.
+    Python's built-in @cache (an unbounded lru_cache without the LRU bookkeeping)
+    memoizes the top-level result for each n.
     """
-    if n < 2:
-        return n
-    return fibonacci_lru(n - 1) + fibonacci_lru(n - 2)
+    if _fib_native and n <= INT64_FIB_LIMIT:
+        return int(_fib_native(n))
+    return _fib_doubling(n)[0]
 
 # ------------------------------
 # 2. SPLAY TREE IMPLEMENTATION
 # ------------------------------
-class SplayTreeNode:
-    """
-    A simple node for a Splay Tree storing (key, value).
-    In our case: key = n, value = fibonacci(n).
-    """
-    __slots__ = ('key', 'value', 'left', 'right', 'parent')
-    def __init__(self, key, value):
-        self.key = key
-        self.value = value
-        self.left = None
-        self.right = None
-        self.parent = None
+# Index used as a null link in the SplayTree arrays
+NIL = -1
 
 class SplayTree:
     """
     A basic Splay Tree implementation to store computed Fibonacci values.
     On every access (search/insert), the accessed node is splayed (moved) to the root.
+    Splaying is done top-down (Sleator-Tarjan) in a single descent, so nodes
+    need no parent pointers.
+
+    Nodes are stored as a Structure-of-Arrays: node i has key keys[i], value values[i]
+    and children left[i] / right[i] (NIL if absent). Index 0 is a dummy header node
+    used to collect the left/right trees during a splay.
+    In our case: key = n, value = fibonacci(n).
     """
+    __slots__ = ('root', 'keys', 'left', 'right', 'values')
+
     def __init__(self):
-        self.root = None
-
-    def _rotate_left(self, x):
-        y = x.right
-        x.right = y.left
-        if y.left:
-            y.left.parent = x
-        y.parent = x.parent
-        if not x.parent:
-            self.root = y
-        elif x == x.parent.left:
-            x.parent.left = y
-        else:
-            x.parent.right = y
-        y.left = x
-        x.parent = y
-
-    def _rotate_right(self, x):
-        y = x.left
-        x.left = y.right
-        if y.right:
-            y.right.parent = x
-        y.parent = x.parent
-        if not x.parent:
-            self.root = y
-        elif x == x.parent.right:
-            x.parent.right = y
-        else:
-            x.parent.left = y
-        y.right = x
-        x.parent = y
+        self.clear()
 
-    def _splay(self, x):
+    def clear(self):
         """
-        Bring node x to the root of the tree.
+        Remove all nodes, leaving only the dummy header.
         """
-        while x.parent:
-            if not x.parent.parent:
-                # Zig step
-                if x.parent.left == x:
-                    self._rotate_right(x.parent)
-                else:
-                    self._rotate_left(x.parent)
-            elif x.parent.left == x and x.parent.parent.left == x.parent:
-                # Zig-zig step (right-right)
-                self._rotate_right(x.parent.parent)
-                self._rotate_right(x.parent)
-            elif x.parent.right == x and x.parent.parent.right == x.parent:
-                # Zig-zig step (left-left)
-                self._rotate_left(x.parent.parent)
-                self._rotate_left(x.parent)
-            elif x.parent.left == x and x.parent.parent.right == x.parent:
-                # Zig-zag step (right-left)
-                self._rotate_right(x.parent)
-                self._rotate_left(x.parent)
-            else:
-                # Zig-zag step (left-right)
-                self._rotate_left(x.parent)
-                self._rotate_right(x.parent)
+        self.root = NIL
+        self.keys = array('l', [0])
+        self.left = array('l', [NIL])
+        self.right = array('l', [NIL])
+        self.values = [None]
 
-    def search(self, key) -> SplayTreeNode:
+    def _new_node(self, key, value) -> int:
         """
-        Search for a node with the given key. If found, splay it. 
-        If not found, splay the last accessed node.
+        Append a detached node to the arrays and return its index.
         """
-        node = self.root
-        prev = None
-        while node:
-            prev = node
-            if key == node.key:
-                self._splay(node)
-                return node
-            elif key < node.key:
-                node = node.left
+        self.keys.append(key)
+        self.left.append(NIL)
+        self.right.append(NIL)
+        self.values.append(value)
+        return len(self.values) - 1
+
+    def _splay(self, t, key) -> int:
+        """
+        Splay the subtree rooted at node t around 'key' and return its new root.
+        The new root is the node with 'key' if present, otherwise
+        the last node on the search path (its predecessor or successor).
+        """
+        keys = self.keys
+        left_of = self.left
+        right_of = self.right
+        left_of[0] = right_of[0] = NIL
+        left = right = 0
+        while True:
+            if key < keys[t]:
+                y = left_of[t]
+                if y == NIL:
+                    break
+                if key < keys[y]:
+                    # Zig-zig: rotate right
+                    left_of[t] = right_of[y]
+                    right_of[y] = t
+                    t = y
+                    if left_of[t] == NIL:
+                        break
+                # Link t into the right tree
+                left_of[right] = t
+                right = t
+                t = left_of[t]
+            elif key > keys[t]:
+                y = right_of[t]
+                if y == NIL:
+                    break
+                if key > keys[y]:
+                    # Zig-zig: rotate left
+                    right_of[t] = left_of[y]
+                    left_of[y] = t
+                    t = y
+                    if right_of[t] == NIL:
+                        break
+                # Link t into the left tree
+                right_of[left] = t
+                left = t
+                t = right_of[t]
             else:
-                node = node.right
-        if prev:
-            self._splay(prev)
-        return None  # key not found
+                break
+        # Assemble the left tree, t and the right tree
+        right_of[left] = left_of[t]
+        left_of[right] = right_of[t]
+        left_of[t] = right_of[0]
+        right_of[t] = left_of[0]
+        return t
+
+    def search(self, key) -> int:
+        """
+        Search for a node with the given key. If found, splay it and return its index.
+        If not found, splay the last accessed node and return NIL.
+        """
+        if self.root == NIL:
+            return NIL
+        self.root = self._splay(self.root, key)
+        if self.keys[self.root] == key:
+            return self.root
+        return NIL  # key not found
+
+    def floor(self, key) -> int:
+        """
+        Find the node with the largest key <= 'key', splay it and return its index.
+        If no such node exists, splay the last accessed node and return NIL.
+        """
+        if self.root == NIL:
+            return NIL
+        root = self.root = self._splay(self.root, key)
+        if self.keys[root] <= key:
+            return root
+        if self.left[root] == NIL:
+            return NIL
+        # root is the successor of 'key': the floor is the maximum of its left subtree
+        best = self._splay(self.left[root], key)
+        self.left[root] = NIL
+        self.right[best] = root
+        self.root = best
+        return best
 
     def insert(self, key, value):
         """
         Insert a new node (key, value) into the Splay Tree, then splay it to root.
         """
-        if not self.root:
-            self.root = SplayTreeNode(key, value)
+        if self.root == NIL:
+            self.root = self._new_node(key, value)
             return
-        node = self.root
-        parent = None
-        while node:
-            parent = node
-            if key < node.key:
-                node = node.left
-            elif key > node.key:
-                node = node.right
-            else:
-                # If key already exists, just update the value and splay
-                node.value = value
-                self._splay(node)
-                return
-        new_node = SplayTreeNode(key, value)
-        new_node.parent = parent
-        if key < parent.key:
-            parent.left = new_node
+        root = self._splay(self.root, key)
+        if key == self.keys[root]:
+            # If key already exists, just update the value
+            self.values[root] = value
+            self.root = root
+            return
+        left_of = self.left
+        right_of = self.right
+        new_node = self._new_node(key, value)
+        if key < self.keys[root]:
+            left_of[new_node] = left_of[root]
+            right_of[new_node] = root
+            left_of[root] = NIL
         else:
-            parent.right = new_node
-        self._splay(new_node)
+            right_of[new_node] = right_of[root]
+            left_of[new_node] = root
+            right_of[root] = NIL
+        self.root = new_node
 
 # ------------------------------
-# 3. SPLAY-BASED FIBONACCI
+# 3. SPLAY-BASED FIBONACCI (AND DICT BASELINE)
 # ------------------------------
 def fibonacci_splay(n: int, tree: SplayTree) -> int:
     """
     Compute the nth Fibonacci number using a Splay Tree to cache previously computed values.
     - If 'n' is found in the tree, return the cached value.
-    - Otherwise compute recursively, store in tree, and return.
+    - Otherwise continue iteratively from the largest cached index below 'n',
+      inserting every new value into the tree, and return F(n).
     """
-    node = tree.search(n)
-    if node:
+    # A single descent finds either 'n' itself or the largest cached k < n
+    node = tree.floor(n)
+    if node != NIL and tree.keys[node] == n:
         # Found it in the tree
-        return node.value
-    # Not found, compute recursively
+        return tree.values[node]
     if n < 2:
-        fib_val = n
+        tree.insert(n, n)
+        return n
+
+    # Not found, resume from the largest cached pair (F(k-1), F(k)) with k < n.
+    # F(k) is now at the root, so F(k-1), if cached, is the maximum of its left subtree.
+    prev = tree.search(tree.keys[node] - 1) if node != NIL and tree.keys[node] > 0 else NIL
+    if prev != NIL:
+        k, a, b = tree.keys[node], tree.values[prev], tree.values[node]
     else:
-        fib_val = fibonacci_splay(n - 1, tree) + fibonacci_splay(n - 2, tree)
-    tree.insert(n, fib_val)
-    return fib_val
+        k, a, b = 1, 0, 1
+        tree.insert(0, a)
+        tree.insert(1, b)
+
+    for i in range(k + 1, n + 1):
+        a, b = b, a + b
+        tree.insert(i, b)
+    return b
+
+def fibonacci_dict(n: int, memo: dict) -> int:
+    """
+    Compute the nth Fibonacci number using a plain dict as the cache.
+    Same bottom-up fill as fibonacci_splay, but every lookup is a single hash probe.
+    The memo always holds a contiguous prefix F(0)..F(k), so k = len(memo) - 1.
+    """
+    value = memo.get(n)
+    if value is not None:
+        return value
+    if n < 2:
+        memo[n] = n
+        return n
+
+    if len(memo) >= 2:
+        k = len(memo) - 1
+        a, b = memo[k - 1], memo[k]
+    else:
+        k, a, b = 1, 0, 1
+        memo[0] = a
+        memo[1] = b
+
+    for i in range(k + 1, n + 1):
+        a, b = b, a + b
+        memo[i] = b
+    return b
 
 # ------------------------------
 # 4. PERFORMANCE COMPARISON
 # ------------------------------
-def measure_execution_times(ns):
+# Number of timed samples per n; the minimum is reported
+REPEAT = 7
+# Calls per sample when timing warm (cache-hit) lookups, to get above timer resolution
+WARM_NUMBER = 1000
+# Output file for the comparison plot
+PLOT_FILE = 'fib_compare.png'
+
+def measure_execution_times(ns, warm=False):
     """
-    Measures execution times for fibonacci_lru and fibonacci_splay for given list of n-values.
+    Measures execution times for fibonacci_lru, fibonacci_splay and fibonacci_dict
+    for given list of n-values.
     :param ns: list of integer n-values (e.g., [0, 50, 100, ...]).
-    :return: two lists of times: times_lru, times_splay
+    :param warm: if False, time cold calls (caches cleared before every sample);
+                 if True, precompute all values up to max(ns) once and time pure cache hits.
+    :return: three lists of times: times_lru, times_splay, times_dict
     """
     times_lru = []
     times_splay = []
+    times_dict = []
 
-    # We create a single SplayTree instance for all Fibonacci computations
-    # because we want the caching effect to persist across calls.
     tree = SplayTree()
+    memo = {}
 
-    # Clear LRU cache before measurement
-    fibonacci_lru.cache_clear()
+    if warm:
+        # Fill every cache once before the timing loop, so each timed call is a lookup
+        fibonacci_lru.cache_clear()
+        for n in ns:
+            fibonacci_lru(n)
+        fibonacci_splay(max(ns), tree)
+        fibonacci_dict(max(ns), memo)
+        number = WARM_NUMBER
+        setup_lru = setup_splay = setup_dict = 'pass'
+    else:
+        # Every sample is a single cold call: the caches are cleared in the (untimed) setup,
+        # so calls 2..N are not pure cache hits.
+        number = 1
+        setup_lru = fibonacci_lru.cache_clear
+        setup_splay = tree.clear
+        setup_dict = memo.clear
 
-    # We'll use 'timeit.timeit' with a small number of repeats to get an average
+    # The best of REPEAT samples is reported, as time per call
     for n in ns:
         # LRU measurement
-        setup_code_lru = (
-            "from __main__ import fibonacci_lru\n"
-            f"n = {n}"
-        )
-        stmt_lru = "fibonacci_lru(n)"
-        time_lru = timeit.timeit(stmt=stmt_lru, setup=setup_code_lru, number=5)
-        avg_lru = time_lru / 5.0
-        times_lru.append(avg_lru)
-
-        # Splay measurement
-        setup_code_splay = (
-            "from __main__ import fibonacci_splay, SplayTreeNode, SplayTree\n"
-            f"tree_arg = tree\n"  # we need the same 'tree' across calls
-            f"n = {n}"
-        )
-        # Because we reference the same object `tree` from measure_execution_times scope,
-        # we can do it by using 'global' or direct referencing. We'll demonstrate the logic.
-        # We'll define a snippet to call fibonacci_splay(n, tree_arg).
-        stmt_splay = "fibonacci_splay(n, tree_arg)"
-        # We'll rely on the fact that Python 3 closures can capture 'tree' var, 
-        # or you can do a trick with partial. 
-        # For timeit to see 'tree_arg', it either needs to be global or in the setup_code_splay.
-        # We put 'tree_arg = tree' into the main code, but let's be consistent with global usage.
-        # It's a simplified approach; in a real scenario, you'd pass references differently.
-        
-        # Because timeit won't directly see `tree` unless we do something explicit,
-        # we will define a function inside measure_execution_times:
-        def fib_splay_call():
-            return fibonacci_splay(n, tree)
-
-        # We measure time with timeit but use a lambda or direct function call
-        time_splay = timeit.timeit(
-            fib_splay_call,
-            number=5
-        )
-        avg_splay = time_splay / 5.0
-        times_splay.append(avg_splay)
-
-    return times_lru, times_splay
+        samples = timeit.repeat(partial(fibonacci_lru, n), setup=setup_lru,
+                                number=number, repeat=REPEAT)
+        times_lru.append(min(samples) / number)
+
+        # Splay measurement: the same tree object, emptied before every cold sample
+        samples = timeit.repeat(partial(fibonacci_splay, n, tree), setup=setup_splay,
+                                number=number, repeat=REPEAT)
+        times_splay.append(min(samples) / number)
+
+        # Dict measurement: the same memo object, emptied before every cold sample
+        samples = timeit.repeat(partial(fibonacci_dict, n, memo), setup=setup_dict,
+                                number=number, repeat=REPEAT)
+        times_dict.append(min(samples) / number)
+
+    return times_lru, times_splay, times_dict
+
+def print_table(title, ns, times_lru, times_splay, times_dict):
+    """
+    Print a textual table of execution times per n.
+    """
+    print(f"\n{title}")
+    print(f"{'n':<10} {'LRU Cache Time (s)':<20} {'Splay Tree Time (s)':<20} {'Dict Time (s)':<20}")
+    print('-' * 75)
+    for n, t_lru, t_splay, t_dict in zip(ns, times_lru, times_splay, times_dict):
+        print(f"{n:<10} {t_lru:<20.8f} {t_splay:<20.8f} {t_dict:<20.8f}")
 
 def main():
     # 4.1 Create the sequence of n
     ns = list(range(0, 1001, 50))  # 0, 50, 100, 150, ..., 950, 1000
     # If you only want up to 950, do: range(0, 951, 50)
 
-    # 4.2 Measure execution times
-    times_lru, times_splay = measure_execution_times(ns)
+    # 4.2 Measure execution times: cold (compute) and warm (cache lookup)
+    cold = measure_execution_times(ns)
+    warm = measure_execution_times(ns, warm=True)
 
     # 4.3 Build the comparison plot
-    plt.figure(figsize=(8, 5))
-    plt.plot(ns, times_lru, marker='o', label='LRU Cache')
-    plt.plot(ns, times_splay, marker='x', label='Splay Tree')
-    plt.title('Comparison of Fibonacci Computation with LRU Cache vs Splay Tree')
-    plt.xlabel('Fibonacci number index (n)')
-    plt.ylabel('Execution time (seconds)')
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
-
-    # 4.4 Print a textual table
-    print(f"{'n':<10} {'LRU Cache Time (s)':<20} {'Splay Tree Time (s)':<20}")
-    print('-' * 54)
-    for n, t_lru, t_splay in zip(ns, times_lru, times_splay):
-        print(f"{n:<10} {t_lru:<20.8f} {t_splay:<20.8f}")
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    for ax, (times_lru, times_splay, times_dict), label in zip(
+            axes, (cold, warm), ('cold cache', 'warm cache')):
+        ax.plot(ns, times_lru, marker='o', label='LRU Cache')
+        ax.plot(ns, times_splay, marker='x', label='Splay Tree')
+        ax.plot(ns, times_dict, marker='s', label='Dict (baseline)')
+        ax.set_title(f'LRU Cache vs Splay Tree ({label})')
+        ax.set_xlabel('Fibonacci number index (n)')
+        ax.set_ylabel('Execution time (seconds)')
+        ax.grid(True)
+        ax.legend()
+    fig.suptitle('Comparison of Fibonacci Computation with LRU Cache vs Splay Tree')
+    fig.tight_layout()
+    fig.savefig(PLOT_FILE, dpi=120)
+    plt.close(fig)
+    print(f"Plot saved to {PLOT_FILE}")
+
+    # 4.4 Print textual tables
+    print_table("Cold cache (compute from scratch):", ns, *cold)
+    print_table("Warm cache (all values precomputed, pure lookups):", ns, *warm)
 
     # 4.5 Draw short conclusions (example):
     # Compare the times for large n (like 950 or 1000)
@@ -261,6 +376,9 @@ def main():
     print(" - LRU Cache often performs very well due to Python's built-in memoization.")
     print(" - Splay Tree may show different performance characteristics, "
           "especially if the same values are accessed repeatedly.")
+    print(" - The Fibonacci workload inserts each key once in increasing order, so the "
+          "Splay Tree's amortized self-adjusting bound is not exploited; "
+          "a plain dict is the natural baseline.")
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,18 @@
-import random
 import time
+from bisect import bisect_left, bisect_right, insort
 from collections import OrderedDict
 
+import numpy as np
+
+# A segment (L, R) is cached under a single int key: L in the high bits, R in the
+# low KEY_SHIFT bits. Valid for arrays with at most 2**KEY_SHIFT elements.
+KEY_SHIFT = 20
+KEY_MASK = (1 << KEY_SHIFT) - 1
+
+# Query op-codes
+RANGE = 0
+UPDATE = 1
+
 class LRUCache:
     """
     LRUCache(capacity=1000)
@@ -9,6 +20,8 @@ class LRUCache:
     A simple LRU (Least Recently Used) cache implementation based on OrderedDict.
     Stores computed sums for (L, R) segments. If the cache reaches the maximum 
     capacity, the least recently used element is evicted.
+    A sorted list of the packed keys (ordered by L, then R) serves as an interval
+    index, so invalidating the segments that cover an index only scans entries with L <= index.
     """
 
     def __init__(self, capacity=1000):
@@ -18,65 +31,220 @@ class LRUCache:
         :param capacity: Maximum number of items the cache can store.
         """
         self.capacity = capacity
-        self.cache = OrderedDict()  # key: (L, R), value: sum for that range
+        self.cache = OrderedDict()  # key: packed (L, R), value: sum for that range
+        self.sorted_keys = []  # the same keys in ascending order
 
     def get(self, key):
         """
         Retrieve a value from the cache by key and move it to the 
         'most recently used' position.
 
-        :param key: A tuple (L, R) representing the segment of the array.
+        :param key: A packed key (L << KEY_SHIFT) | R representing the segment of the array.
         :return: The cached sum if it exists, otherwise None.
         """
-        if key not in self.cache:
-            return None
-        # Move this key to the end (most recently used).
-        self.cache.move_to_end(key)
-        return self.cache[key]
+        # A single hash probe; cached sums are never None.
+        value = self.cache.get(key)
+        if value is not None:
+            # Move this key to the end (most recently used).
+            self.cache.move_to_end(key)
+        return value
 
     def put(self, key, value):
         """
         Store or update a key-value pair in the cache. 
         If adding the new item exceeds the capacity, the least recently used item is evicted.
 
-        :param key: A tuple (L, R) representing the segment of the array.
+        :param key: A packed key (L << KEY_SHIFT) | R representing the segment of the array.
         :param value: Computed sum for that segment.
         """
         # If the key already exists, move it to the end.
         if key in self.cache:
             self.cache.move_to_end(key)
+        else:
+            insort(self.sorted_keys, key)
         self.cache[key] = value
 
         # Evict the least recently used item if capacity is exceeded.
         if len(self.cache) > self.capacity:
-            self.cache.popitem(last=False)
+            evicted, _ = self.cache.popitem(last=False)
+            self._remove_sorted(evicted)
+
+    def put_new(self, key, value):
+        """
+        Store a key that is known to be absent from the cache (e.g. right after a
+        get() miss), skipping the membership check done by put().
+        If adding the new item exceeds the capacity, the least recently used item is evicted.
+
+        :param key: A packed key (L << KEY_SHIFT) | R that is not in the cache.
+        :param value: Computed sum for that segment.
+        """
+        self.cache[key] = value
+        insort(self.sorted_keys, key)
+
+        # Evict the least recently used item if capacity is exceeded.
+        if len(self.cache) > self.capacity:
+            evicted, _ = self.cache.popitem(last=False)
+            self._remove_sorted(evicted)
+
+    def _remove_sorted(self, key):
+        """
+        Remove a key from the sorted interval index.
+        """
+        del self.sorted_keys[bisect_left(self.sorted_keys, key)]
 
     def invalidate(self, condition_func):
         """
         Remove cache entries that match a certain condition. 
         Typically used after an update operation that changes part of the array.
 
-        :param condition_func: A function that takes (L, R) and returns True
+        :param condition_func: A function that takes a packed key and returns True
                                if the entry should be removed.
         """
         keys_to_remove = [k for k in self.cache.keys() if condition_func(k)]
         for k in keys_to_remove:
             del self.cache[k]
+        if keys_to_remove:
+            self.sorted_keys = [k for k in self.sorted_keys if k in self.cache]
+
+    def invalidate_index(self, index):
+        """
+        Remove all cached segments (L, R) with L <= index <= R.
+        Only keys with L <= index are examined, found by binary search in the sorted index.
+
+        :param index: The array position that has been updated.
+        """
+        sorted_keys = self.sorted_keys
+        # Packed keys sort by L first, so every key with L <= index comes before this bound.
+        end = bisect_right(sorted_keys, (index << KEY_SHIFT) | KEY_MASK)
+        keys_to_remove = [k for k in sorted_keys[:end] if k & KEY_MASK >= index]
+        for k in keys_to_remove:
+            del self.cache[k]
+        if keys_to_remove:
+            stale = set(keys_to_remove)
+            sorted_keys[:end] = [k for k in sorted_keys[:end] if k not in stale]
+
+class FenwickTree:
+    """
+    FenwickTree(array)
+
+    A Fenwick tree (Binary Indexed Tree) over a copy of the array.
+    Supports point updates and range sum queries in O(log N), so Range queries
+    need no cache at all.
+    """
+
+    def __init__(self, array):
+        """
+        Build the tree from the given array in O(N).
+
+        :param array: The array of integers.
+        """
+        self.n = len(array)
+        self.values = [int(v) for v in array]
+        self.tree = [0] + self.values  # 1-based internal layout
+        for i in range(1, self.n + 1):
+            parent = i + (i & -i)
+            if parent <= self.n:
+                self.tree[parent] += self.tree[i]
+
+    def prefix_sum(self, count):
+        """
+        Return the sum of the first 'count' elements, i.e. array[0 : count].
+
+        :param count: Number of leading elements to sum.
+        :return: The prefix sum.
+        """
+        tree = self.tree
+        total = 0
+        while count:
+            total += tree[count]
+            count &= count - 1
+        return total
+
+    def range_sum(self, L, R):
+        """
+        Return the sum of array elements from index L to R (inclusive).
+
+        :param L: Start index (inclusive).
+        :param R: End index (inclusive).
+        :return: The sum of array[L : R+1].
+        """
+        return self.prefix_sum(R + 1) - self.prefix_sum(L)
+
+    def update(self, index, value):
+        """
+        Set array[index] to a new value and propagate the difference.
+
+        :param index: The position in the array to be updated.
+        :param value: The new value to store at array[index].
+        """
+        delta = value - self.values[index]
+        self.values[index] = value
+        tree = self.tree
+        i = index + 1
+        while i <= self.n:
+            tree[i] += delta
+            i += i & -i
+
+class BlockSums:
+    """
+    BlockSums(array, block_size=256)
+
+    Square-root decomposition over a copy of the array: the sum of every
+    fixed-size block is precomputed, so a Range query adds up whole blocks plus
+    two partial ends, and an Update only adjusts one block sum. Unlike an LRU
+    cache of arbitrary (L, R) segments, every block sum is always present.
+    """
+
+    def __init__(self, array, block_size=256):
+        """
+        Precompute the block sums in O(N).
+
+        :param array: The array of integers.
+        :param block_size: Number of elements per block.
+        """
+        self.block_size = block_size
+        self.values = np.array(array, dtype=np.int64)
+        self.block_sums = np.add.reduceat(self.values, np.arange(0, len(self.values), block_size))
+
+    def range_sum(self, L, R):
+        """
+        Return the sum of array elements from index L to R (inclusive).
+
+        :param L: Start index (inclusive).
+        :param R: End index (inclusive).
+        :return: The sum of array[L : R+1].
+        """
+        size = self.block_size
+        first_block = L // size
+        last_block = R // size
+        if first_block == last_block:
+            return int(self.values[L:R+1].sum())
+        # Tail of the first block + whole blocks in between + head of the last block
+        return int(self.values[L:(first_block + 1) * size].sum()
+                   + self.block_sums[first_block + 1:last_block].sum()
+                   + self.values[last_block * size:R+1].sum())
+
+    def update(self, index, value):
+        """
+        Set array[index] to a new value and adjust the sum of its block.
+
+        :param index: The position in the array to be updated.
+        :param value: The new value to store at array[index].
+        """
+        self.block_sums[index // self.block_size] += value - self.values[index]
+        self.values[index] = value
 
 def range_sum_no_cache(array, L, R):
     """
     Compute the sum of array elements from index L to R (inclusive)
-    by simply iterating over the range. No caching involved.
+    with a single vectorized NumPy reduction. No caching involved.
 
-    :param array: The array of integers.
+    :param array: The NumPy array of integers.
     :param L: Start index (inclusive).
     :param R: End index (inclusive).
     :return: The sum of array[L : R+1].
     """
-    total = 0
-    for i in range(L, R+1):
-        total += array[i]
-    return total
+    return int(array[L:R+1].sum())
 
 def update_no_cache(array, index, value):
     """
@@ -94,21 +262,20 @@ def range_sum_with_cache(array, L, R, cache: LRUCache):
     Compute the sum of array elements from L to R (inclusive) 
     using an LRU cache to store previously computed sums.
     
-    :param array: The array of integers.
+    :param array: The NumPy array of integers.
     :param L: Start index (inclusive).
     :param R: End index (inclusive).
     :param cache: An LRUCache object.
     :return: The sum of array[L : R+1], using the cache if available.
     """
-    cached_sum = cache.get((L, R))
+    key = (L << KEY_SHIFT) | R
+    cached_sum = cache.get(key)
     if cached_sum is not None:
         return cached_sum
 
     # If not in the cache, compute and store it.
-    total = 0
-    for i in range(L, R+1):
-        total += array[i]
-    cache.put((L, R), total)
+    total = range_sum_no_cache(array, L, R)
+    cache.put_new(key, total)
     return total
 
 def update_with_cache(array, index, value, cache: LRUCache):
@@ -124,50 +291,66 @@ def update_with_cache(array, index, value, cache: LRUCache):
     """
     array[index] = value
 
-    # Condition to find (L, R) segments that include 'index'.
-    def invalidation_condition(interval):
-        (start, end) = interval
-        return start <= index <= end
+    # Drop the (L, R) segments that include 'index'.
+    cache.invalidate_index(index)
+
+
+def generate_array(N):
+    """
+    Generate a random array of N integers in the range [1, 100].
 
-    cache.invalidate(invalidation_condition)
+    :param N: Size of the array.
+    :return: A contiguous NumPy int64 array of random integers.
+    """
+    return np.random.randint(1, 101, size=N, dtype=np.int64)
 
+def generate_queries(N, Q):
+    """
+    Generate Q random queries over an array of size N:
+    70% Range (L, R) and 30% Update (index, value).
+    Queries are stored column-wise (Structure-of-Arrays) in three parallel lists:
+    ops[i] is RANGE or UPDATE, and (first[i], second[i]) is (L, R) or (index, value).
+
+    :param N: Size of the array.
+    :param Q: Number of queries.
+    :return: A tuple of lists (ops, first, second).
+    """
+    # Generate every column with one vectorized call instead of one Python call per query
+    ops = np.random.choice([RANGE, UPDATE], size=Q, p=[0.7, 0.3])
+    L = np.random.randint(0, N, size=Q)
+    R = np.random.randint(L, N)  # R is uniform in [L, N-1] for each query
+    idx = np.random.randint(0, N, size=Q)
+    val = np.random.randint(1, 101, size=Q)
+
+    is_range = ops == RANGE
+    first = np.where(is_range, L, idx)
+    second = np.where(is_range, R, val)
+    # Plain lists: iterating them yields Python ints rather than NumPy scalars
+    return ops.tolist(), first.tolist(), second.tolist()
 
 def main():
     """
     Demonstrates the usage of the above functions and LRUCache
     by generating a random array and random queries (both Range and Update).
-    Measures execution time with and without caching.
+    Measures execution time with and without caching, and compares both with
+    data structures that need no cache (FenwickTree and BlockSums).
     Includes debug prints every 10,000 operations to indicate progress.
     """
     N = 100_000
     Q = 50_000
     K = 1000
 
-    # 4.1 Generate a random array
-    array = [random.randint(1, 100) for _ in range(N)]
-
-    # 4.2 Generate a list of queries
-    queries = []
-    for _ in range(Q):
-        query_type = random.choices(["Range", "Update"], weights=[0.7, 0.3], k=1)[0]
-        if query_type == "Range":
-            L = random.randint(0, N-1)
-            R = random.randint(L, N-1)
-            queries.append(("Range", L, R))
-        else:
-            idx = random.randint(0, N-1)
-            val = random.randint(1, 100)
-            queries.append(("Update", idx, val))
+    # 4.1 Generate a random array and a list of queries
+    array = generate_array(N)
+    ops, first, second = generate_queries(N, Q)
 
     print("Starting execution WITHOUT cache...")
     start_no_cache = time.time()
-    for i, q in enumerate(queries, start=1):
-        if q[0] == "Range":
-            _, L, R = q
-            range_sum_no_cache(array, L, R)
+    for i, (op, a, b) in enumerate(zip(ops, first, second), start=1):
+        if op == RANGE:
+            range_sum_no_cache(array, a, b)
         else:
-            _, idx, val = q
-            update_no_cache(array, idx, val)
+            update_no_cache(array, a, b)
 
         # Debug print every 10,000 queries
         if i % 10000 == 0:
@@ -177,29 +360,17 @@ def main():
     no_cache_time = end_no_cache - start_no_cache
 
     # For a fair comparison, re-generate array and queries
-    array = [random.randint(1, 100) for _ in range(N)]
-    queries = []
-    for _ in range(Q):
-        query_type = random.choices(["Range", "Update"], weights=[0.7, 0.3], k=1)[0]
-        if query_type == "Range":
-            L = random.randint(0, N-1)
-            R = random.randint(L, N-1)
-            queries.append(("Range", L, R))
-        else:
-            idx = random.randint(0, N-1)
-            val = random.randint(1, 100)
-            queries.append(("Update", idx, val))
+    array = generate_array(N)
+    ops, first, second = generate_queries(N, Q)
 
     print("Starting execution WITH LRU cache...")
     lru_cache = LRUCache(capacity=K)
     start_with_cache = time.time()
-    for i, q in enumerate(queries, start=1):
-        if q[0] == "Range":
-            _, L, R = q
-            range_sum_with_cache(array, L, R, lru_cache)
+    for i, (op, a, b) in enumerate(zip(ops, first, second), start=1):
+        if op == RANGE:
+            range_sum_with_cache(array, a, b, lru_cache)
         else:
-            _, idx, val = q
-            update_with_cache(array, idx, val, lru_cache)
+            update_with_cache(array, a, b, lru_cache)
 
         # Debug print every 10,000 queries
         if i % 10000 == 0:
@@ -208,8 +379,50 @@ def main():
     end_with_cache = time.time()
     with_cache_time = end_with_cache - start_with_cache
 
+    # Same workload on a Fenwick tree: a better data structure instead of a cache
+    array = generate_array(N)
+    ops, first, second = generate_queries(N, Q)
+
+    print("Starting execution WITH Fenwick tree...")
+    fenwick = FenwickTree(array)
+    start_fenwick = time.time()
+    for i, (op, a, b) in enumerate(zip(ops, first, second), start=1):
+        if op == RANGE:
+            fenwick.range_sum(a, b)
+        else:
+            fenwick.update(a, b)
+
+        # Debug print every 10,000 queries
+        if i % 10000 == 0:
+            print(f"[FENWICK] Processed {i} queries out of {Q}...")
+
+    end_fenwick = time.time()
+    fenwick_time = end_fenwick - start_fenwick
+
+    # Same workload with precomputed block sums (square-root decomposition)
+    array = generate_array(N)
+    ops, first, second = generate_queries(N, Q)
+
+    print("Starting execution WITH block sums...")
+    blocks = BlockSums(array)
+    start_blocks = time.time()
+    for i, (op, a, b) in enumerate(zip(ops, first, second), start=1):
+        if op == RANGE:
+            blocks.range_sum(a, b)
+        else:
+            blocks.update(a, b)
+
+        # Debug print every 10,000 queries
+        if i % 10000 == 0:
+            print(f"[BLOCK SUMS] Processed {i} queries out of {Q}...")
+
+    end_blocks = time.time()
+    blocks_time = end_blocks - start_blocks
+
     print(f"Execution time without cache: {no_cache_time:.2f} seconds")
     print(f"Execution time with LRU cache: {with_cache_time:.2f} seconds")
+    print(f"Execution time with Fenwick tree: {fenwick_time:.2f} seconds")
+    print(f"Execution time with block sums: {blocks_time:.2f} seconds")
 
 if __name__ == "__main__":
     main()